@@ -1,6 +1,8 @@
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
+import pandas as pd
+import altair as alt
+from modelo import factores_ambientales, ejecutar_modelo_nb
 
 # =========================================================
 # CONFIGURACIÓN ZODION
@@ -28,61 +30,34 @@ dias_sim = st.sidebar.slider("Días de seguimiento", 30, 180, 120)
 # =========================================================
 # MOTOR DE SIMULACIÓN
 # =========================================================
+# Memoización: los reruns de Streamlit con los mismos parámetros no recalculan
+@st.cache_data(show_spinner=False, max_entries=128)
 def ejecutar_modelo(dias, n_inicial, a_inicial, T, H, intensidad):
-    N = np.zeros(dias)
-    A = np.zeros(dias)
-    banco_ootecas = np.zeros(dias + 100)
-    
-    N[0] = n_inicial
-    A[0] = a_inicial
-    
-    # Factores ambientales (0.0 a 1.0)
-    fT = 1.0 if 25 <= T <= 32 else max(0.2, 1 - abs(T - 28) / 15)
-    fH = 1.0 if 50 <= H <= 80 else max(0.4, 1 - abs(H - 65) / 40)
-    
-    # Tiempo de eclosión (biología real)
-    retraso = int(28 / (0.7 + 0.3 * fT))
-    
-    # Ootecas iniciales (la "herencia" de la plaga antes del servicio)
-    for i in range(retraso):
-        banco_ootecas[i] = (a_inicial * 0.4) * 30 # 40% hembras cargadas
-
-    for t in range(dias - 1):
-        # 1. Eclosión (Nuevas ninfas hoy)
-        emergentes = banco_ootecas[t]
-
-        # 2. Mortalidad por Indoxacarb (AJUSTADA)
-        # Indoxacarb es potente: Adultos mueren 25% diario, ninfas 12% con intensidad 1.0
-        m_adultos = intensidad * 0.25 * fT
-        m_ninfas = intensidad * 0.12 * fT
-        
-        # 3. Natalidad (Nuevas ootecas puestas hoy)
-        # Solo adultos que sobreviven al veneno pueden poner ootecas
-        futura = t + retraso
-        if futura < len(banco_ootecas):
-            banco_ootecas[futura] += A[t] * (0.05 * fT * fH) * 30
-
-        # 4. Maduración (Ninfas a adultos)
-        maduracion = N[t] * (0.015 * fT)
-
-        # 5. Evolución
-        N[t+1] = max(0, N[t] + emergentes - (m_ninfas + 0.01) * N[t] - maduracion)
-        A[t+1] = max(0, A[t] + maduracion - (m_adultos + 0.005) * A[t])
-        
-    return N, A
+    fT, fH = factores_ambientales(T, H)
+    estado = np.empty((2, int(dias)))
+    ejecutar_modelo_nb(estado, float(n_inicial), float(a_inicial),
+                       float(fT), float(fH), float(intensidad))
+    return estado[0], estado[1]
 
 # =========================================================
 # RESULTADOS
 # =========================================================
+# Series de la gráfica de evolución y sus colores
+SERIES = ["Ninfas (Eclosión)", "Adultos", "Carga Total"]
+COLORES = ["orange", "green", "gray"]
+
 if st.button("🚀 Iniciar Simulación Biológica"):
     n_res, a_res = ejecutar_modelo(dias_sim, n_ini, a_ini, temp, hum, trat)
     
+    # Carga total (ninfas + adultos), calculada una sola vez
+    total = n_res + a_res
+
     pob_ini = n_ini + a_ini
-    pob_fin = n_res[-1] + a_res[-1]
+    pob_fin = total[-1]
     
     # Cálculo de éxito basado en la población máxima alcanzada vs final
     # (Para evitar el error de 0% si la plaga crece al principio por las ootecas)
-    pob_maxima = max(pob_ini, np.max(n_res + a_res))
+    pob_maxima = max(pob_ini, np.max(total))
     exito = max(0, (1 - (pob_fin / pob_maxima)) * 100)
 
     # Métricas
@@ -92,15 +67,25 @@ if st.button("🚀 Iniciar Simulación Biológica"):
     c2.metric("Éxito del Control", f"{exito:.1f}%", delta=f"{int(pob_maxima - pob_fin)} eliminados")
     c3.metric("Ninfas Activas", f"{int(n_res[-1])}")
 
-    # Gráfica
-    t = np.arange(dias_sim)
-    fig, ax = plt.subplots(figsize=(10, 4))
-    ax.plot(t, n_res, label="Ninfas (Eclosión)", color="orange", lw=2)
-    ax.plot(t, a_res, label="Adultos", color="green", lw=2)
-    ax.fill_between(t, n_res + a_res, color="gray", alpha=0.1, label="Carga Total")
-    ax.set_title(f"Análisis de Control ZODION - Éxito: {exito:.1f}%")
-    ax.legend()
-    st.pyplot(fig)
+    # Gráfica (Vega-Lite en el navegador: el servidor solo envía ninfas y
+    # adultos; la carga total y el formato largo se calculan en el cliente)
+    datos = pd.DataFrame({
+        "Día": np.arange(dias_sim),
+        "Ninfas (Eclosión)": n_res,
+        "Adultos": a_res,
+    })
+    base = alt.Chart(datos).transform_calculate(
+        **{"Carga Total": alt.datum["Ninfas (Eclosión)"] + alt.datum["Adultos"]}
+    ).transform_fold(SERIES, as_=["Serie", "Individuos"]).encode(
+        x="Día:Q",
+        y="Individuos:Q",
+        color=alt.Color("Serie:N", scale=alt.Scale(domain=SERIES, range=COLORES),
+                        legend=alt.Legend(title=None, symbolOpacity=1)),
+    )
+    carga = base.transform_filter(alt.datum.Serie == "Carga Total").mark_area(opacity=0.1)
+    curvas = base.transform_filter(alt.datum.Serie != "Carga Total").mark_line(strokeWidth=2)
+    st.altair_chart((carga + curvas).properties(
+        title=f"Análisis de Control ZODION - Éxito: {exito:.1f}%"))
 
     if exito < 50:
         st.error("🚨 **Alerta:** La tasa de eclosión supera la velocidad del tratamiento.")